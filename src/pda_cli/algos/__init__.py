@@ -2,14 +2,38 @@ from typing import Callable, Dict, Optional
 
 import numpy as np
 
-from .acf import autocorrelation
-from .mpm import mpm
-from .yin import yin
-from .zcr import zero_crossing_rate
+from .acf import autocorrelation, autocorrelation_result
+from .cascade import CASCADE_FINAL, Cascade, build_cascade, decimated, guided
+from .mpm import mpm, mpm_result
+from .result import NO_PITCH, PitchResult
+from .tracking import TRACKABLE, PitchTracker
+from .yin import yin, yin_result
+from .zcr import zero_crossing_rate, zero_crossing_rate_result
 
-__all__ = ["zero_crossing_rate", "autocorrelation", "yin", "mpm", "ALGORITHMS"]
+__all__ = [
+    "zero_crossing_rate",
+    "autocorrelation",
+    "yin",
+    "mpm",
+    "zero_crossing_rate_result",
+    "autocorrelation_result",
+    "yin_result",
+    "mpm_result",
+    "ALGORITHMS",
+    "DETECTORS",
+    "PitchResult",
+    "NO_PITCH",
+    "PitchTracker",
+    "TRACKABLE",
+    "Cascade",
+    "CASCADE_FINAL",
+    "build_cascade",
+    "decimated",
+    "guided",
+]
 
 PitchDetector = Callable[[np.ndarray, int], Optional[float]]
+ResultDetector = Callable[[np.ndarray, int], PitchResult]
 
 ALGORITHMS: Dict[str, PitchDetector] = {
     "zcr": zero_crossing_rate,
@@ -17,3 +41,10 @@ ALGORITHMS: Dict[str, PitchDetector] = {
     "yin": yin,
     "mpm": mpm,
 }
+
+DETECTORS: Dict[str, ResultDetector] = {
+    "zcr": zero_crossing_rate_result,
+    "acf": autocorrelation_result,
+    "yin": yin_result,
+    "mpm": mpm_result,
+}
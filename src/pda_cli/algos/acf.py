@@ -2,35 +2,94 @@ from typing import Optional
 
 import numpy as np
 
+from .kernels import band_products
+from .result import NO_PITCH, PitchResult, clamp_confidence
+from .tracking import LagBands, clip_bands
 
-def autocorrelation(signal: np.ndarray, sample_rate: int) -> Optional[float]:
+
+def autocorrelation(
+    signal: np.ndarray, sample_rate: int, lag_bands: Optional[LagBands] = None
+) -> Optional[float]:
     """Autocorrelation-based pitch detection.
 
     Args:
         signal: Audio signal as numpy array
         sample_rate: Sample rate in Hz
+        lag_bands: Only search these ``(lo, hi)`` lag ranges (default: all)
 
     Returns:
         Detected frequency in Hz, or None if no pitch detected
     """
-    signal = signal - np.mean(signal)
+    return autocorrelation_result(signal, sample_rate, lag_bands).frequency
 
-    correlation = np.correlate(signal, signal, mode="full")
-    correlation = correlation[len(correlation) // 2 :]
+
+def autocorrelation_result(
+    signal: np.ndarray, sample_rate: int, lag_bands: Optional[LagBands] = None
+) -> PitchResult:
+    """Autocorrelation-based pitch detection with a confidence score.
+
+    Args:
+        signal: Audio signal as numpy array
+        sample_rate: Sample rate in Hz
+        lag_bands: Only search these ``(lo, hi)`` lag ranges (default: all)
+
+    Returns:
+        PitchResult whose confidence is the peak-to-zero-lag correlation ratio
+    """
+    signal = signal - np.mean(signal)
 
     min_period = int(sample_rate / 1000)  # 1000 Hz max
     max_period = int(sample_rate / 50)  # 50 Hz min
 
+    if lag_bands is not None:
+        bands = clip_bands(lag_bands, 1, len(signal))
+        return _acf_bands(signal, sample_rate, bands, min_period, max_period)
+
+    correlation = np.correlate(signal, signal, mode="full")
+    correlation = correlation[len(correlation) // 2 :]
+
     if max_period > len(correlation):
         max_period = len(correlation)
 
+    # Keep the zero-lag energy before masking out the short lags
+    energy = correlation[0]
     correlation[:min_period] = 0
 
     if max_period > min_period:
         peak_idx = np.argmax(correlation[min_period:max_period]) + min_period
 
-        if correlation[peak_idx] > 0.3 * correlation[0]:
+        if correlation[peak_idx] > 0.3 * energy:
             frequency = sample_rate / peak_idx
-            return frequency
+            ratio = correlation[peak_idx] / energy
+            return PitchResult(frequency, clamp_confidence(ratio))
+
+    return NO_PITCH
+
+
+def _acf_bands(
+    signal: np.ndarray,
+    sample_rate: int,
+    bands: LagBands,
+    min_period: int,
+    max_period: int,
+) -> PitchResult:
+    """Autocorrelation restricted to a few lag bands."""
+    energy = np.dot(signal, signal)
+    best_val = 0.0
+    best_idx = 0
+
+    for lo, hi in bands:
+        correlation = band_products(signal, lo, hi)
+        k = int(np.argmax(correlation))
+        if not min_period <= lo + k < max_period:
+            continue
+
+        # Skip band edges, they are slopes rather than peaks
+        if 0 < k < len(correlation) - 1 and correlation[k] > best_val:
+            best_val = correlation[k]
+            best_idx = lo + k
+
+    if best_idx and best_val > 0.3 * energy:
+        return PitchResult(sample_rate / best_idx, clamp_confidence(best_val / energy))
 
-    return None
+    return NO_PITCH
@@ -0,0 +1,142 @@
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from .acf import autocorrelation_result
+from .mpm import mpm_result
+from .result import NO_PITCH, PitchResult
+from .tracking import divisor_bands
+from .yin import yin_result
+from .zcr import zero_crossing_rate_result
+
+ResultDetector = Callable[[np.ndarray, int], PitchResult]
+
+# Detectors a cascade may escalate to
+CASCADE_FINAL = {"yin": yin_result, "mpm": mpm_result}
+
+
+def decimated(detector: ResultDetector, factor: int = 4) -> ResultDetector:
+    """Run a detector on a block-averaged, downsampled signal.
+
+    Args:
+        detector: Detector returning a PitchResult
+        factor: Downsampling factor (default: 4)
+
+    Returns:
+        Detector with the same signature working on 1/factor of the samples
+    """
+
+    def _detect(signal: np.ndarray, sample_rate: int) -> PitchResult:
+        n = len(signal) // factor * factor
+        # Block averaging doubles as a crude anti-aliasing filter
+        reduced = signal[:n].reshape(-1, factor).mean(axis=1)
+        return detector(reduced, sample_rate // factor)
+
+    return _detect
+
+
+def guided(
+    estimator: ResultDetector, detector: Callable[..., PitchResult]
+) -> ResultDetector:
+    """Let a cheap estimate pick the lag bands a precise detector searches.
+
+    A coarse stage can be periodic enough to look confident while being off
+    by a few cents or a whole octave. Its period only selects bands around
+    the estimate, its double and its divisors; the answer and its
+    confidence come from ``detector``.
+
+    Args:
+        estimator: Cheap detector returning a PitchResult
+        detector: Detector accepting a ``lag_bands`` argument
+
+    Returns:
+        Detector with the same signature as ``estimator``
+    """
+
+    def _detect(signal: np.ndarray, sample_rate: int) -> PitchResult:
+        estimate = estimator(signal, sample_rate)
+        if not estimate.frequency:
+            return NO_PITCH
+        bands = divisor_bands(sample_rate / estimate.frequency)
+        return detector(signal, sample_rate, lag_bands=bands)
+
+    return _detect
+
+
+class Cascade:
+    """Cheap-first detector chain with confidence-based escalation.
+
+    Each stage but the last is trusted only when it finds a pitch with at
+    least ``min_confidence``; otherwise the frame goes to the next stage.
+    The last stage always answers.
+    """
+
+    def __init__(
+        self, stages: List[Tuple[str, ResultDetector]], min_confidence: float = 0.9
+    ):
+        self.stages = stages
+        self.min_confidence = min_confidence
+        self.calls: Dict[str, int] = {name: 0 for name, _ in stages}
+        self.escalations: Dict[str, int] = {name: 0 for name, _ in stages}
+
+    def detect(self, signal: np.ndarray, sample_rate: int) -> PitchResult:
+        """Detect pitch with the cheapest confident stage.
+
+        Args:
+            signal: Audio signal as numpy array
+            sample_rate: Sample rate in Hz
+
+        Returns:
+            PitchResult from the stage that answered
+        """
+        for name, detector in self.stages[:-1]:
+            self.calls[name] += 1
+            result = detector(signal, sample_rate)
+            if result.frequency and result.confidence >= self.min_confidence:
+                return result
+            self.escalations[name] += 1
+
+        name, detector = self.stages[-1]
+        self.calls[name] += 1
+        return detector(signal, sample_rate)
+
+    def escalation_rates(self) -> Dict[str, float]:
+        """Fraction of frames each escalating stage passed on."""
+        return {
+            name: self.escalations[name] / self.calls[name] if self.calls[name] else 0.0
+            for name, _ in self.stages[:-1]
+        }
+
+    def summary(self) -> str:
+        """One-line report of per-stage escalation rates."""
+        rates = self.escalation_rates()
+        parts = [
+            f"{name} {rates[name] * 100:.1f}% of {self.calls[name]}"
+            for name, _ in self.stages[:-1]
+        ]
+        final = self.stages[-1][0]
+        return f"Escalated: {', '.join(parts)}; {final} ran {self.calls[final]}x"
+
+
+def build_cascade(final: str = "yin", min_confidence: float = 0.9) -> Cascade:
+    """Build the default ZCR -> decimated ACF -> YIN/MPM cascade.
+
+    The ZCR and decimated ACF stages only narrow the search; a confident
+    answer from either is a banded run of the final detector.
+
+    Args:
+        final: Detector of last resort, ``"yin"`` or ``"mpm"`` (default: yin)
+        min_confidence: Confidence needed to stop early (default: 0.9)
+
+    Returns:
+        Configured Cascade
+    """
+    detector = CASCADE_FINAL[final]
+    return Cascade(
+        [
+            ("zcr", guided(zero_crossing_rate_result, detector)),
+            ("acf/4", guided(decimated(autocorrelation_result, 4), detector)),
+            (final, detector),
+        ],
+        min_confidence=min_confidence,
+    )
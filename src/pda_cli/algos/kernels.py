@@ -0,0 +1,200 @@
+"""Inner loops shared by the lag-domain detectors.
+
+The difference function and NSDF are vectorized with NumPy. The sequential
+scans (YIN's dip search, MPM's peak picking and parabolic refinement) are
+plain loops; when Numba is installed they are compiled on first use and
+cached on disk, otherwise they run as pure Python.
+"""
+
+from typing import Any, Callable, Tuple, TypeVar
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+
+JIT_AVAILABLE = numba is not None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _jit(func: F) -> F:
+    """Compile with Numba when available, caching the result on disk."""
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)  # type: ignore[no-any-return]
+
+
+def energy_prefix(signal: np.ndarray) -> np.ndarray:
+    """Cumulative sum of squares with a leading zero, in float64."""
+    return np.concatenate(([0.0], np.cumsum(signal.astype(np.float64) ** 2)))
+
+
+def _lag_products(signal: np.ndarray, max_lag: int) -> np.ndarray:
+    """``sum(signal[i] * signal[i + tau])`` for ``tau`` in ``range(max_lag)``."""
+    x = signal.astype(np.float64)
+    correlation = np.correlate(x, x, mode="full")
+    return correlation[len(x) - 1 : len(x) - 1 + max_lag]
+
+
+def band_products(signal: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    """Lag products for ``tau`` in ``range(lo, hi)`` only.
+
+    One correlation of the frame against a zero-padded slice of itself, so
+    the cost is proportional to the band width rather than the frame length.
+
+    Args:
+        signal: Audio signal as numpy array
+        lo: First lag
+        hi: One past the last lag
+
+    Returns:
+        ``sum(signal[i] * signal[i + tau])`` for each lag in the band
+    """
+    x = signal.astype(np.float64)
+    padded = np.concatenate((x[lo:], np.zeros(hi - lo - 1)))
+    return np.correlate(padded, x[: len(x) - lo], mode="valid")
+
+
+def segment_energies(
+    energy: np.ndarray, lo: int, hi: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Energies of the two overlapping segments for each lag in a band.
+
+    Args:
+        energy: Output of ``energy_prefix`` for the frame
+        lo: First lag
+        hi: One past the last lag
+
+    Returns:
+        Tuple of (head, tail) energies, ``signal[:N - tau]`` and ``signal[tau:]``
+    """
+    N = len(energy) - 1
+    taus = np.arange(lo, hi)
+    return energy[N - taus], energy[N] - energy[taus]
+
+
+def difference(signal: np.ndarray, tau_max: int) -> np.ndarray:
+    """YIN difference function, vectorized.
+
+    Args:
+        signal: Audio signal as numpy array
+        tau_max: Number of lags to compute
+
+    Returns:
+        ``d(tau)`` for ``tau`` in ``range(tau_max)``, with ``d(0) = 0``
+    """
+    W = len(signal)
+    energy = energy_prefix(signal)
+    taus = np.arange(tau_max)
+    head = energy[W - taus]
+    tail = energy[W] - energy[taus]
+    df = head + tail - 2 * _lag_products(signal, tau_max)
+    df[0] = 0.0
+    clipped: np.ndarray = np.maximum(df, 0.0)
+    return clipped
+
+
+def nsdf(signal: np.ndarray, max_tau: int) -> np.ndarray:
+    """MPM normalized square difference function, vectorized.
+
+    Args:
+        signal: Audio signal as numpy array
+        max_tau: Number of lags to compute
+
+    Returns:
+        NSDF for ``tau`` in ``range(max_tau)``, 0 where a segment is silent
+    """
+    N = len(signal)
+    energy = energy_prefix(signal)
+    taus = np.arange(max_tau)
+    divisor = np.sqrt(energy[N - taus] * (energy[N] - energy[taus]))
+    acf = _lag_products(signal, max_tau)
+    nsdf = np.zeros(max_tau)
+    voiced = divisor > 0
+    nsdf[voiced] = 2 * acf[voiced] / divisor[voiced]
+    return nsdf
+
+
+def yin_dip(cmndf: np.ndarray, threshold: float) -> int:
+    """Find the first CMNDF dip below threshold and walk to its bottom.
+
+    Args:
+        cmndf: Normalized difference values
+        threshold: YIN threshold
+
+    Returns:
+        Index of the dip; ``len(cmndf) - 1`` or a value at or above the
+        threshold means no dip was found
+    """
+    tau_max = cmndf.shape[0]
+    tau = 1
+    while tau < tau_max - 1:
+        if cmndf[tau] < threshold:
+            while tau + 1 < tau_max and cmndf[tau + 1] < cmndf[tau]:
+                tau += 1
+            break
+        tau += 1
+    return tau
+
+
+def best_key_maximum(nsdf: np.ndarray, threshold: float) -> int:
+    """Pick the highest NSDF key maximum above threshold.
+
+    Key maxima are the peaks of each positive lobe after the first
+    zero crossing.
+
+    Args:
+        nsdf: NSDF values
+        threshold: MPM threshold
+
+    Returns:
+        Index of the chosen peak, or -1 if there is none
+    """
+    max_tau = nsdf.shape[0]
+    best = -1
+    pos = 0
+
+    while pos < max_tau - 1 and nsdf[pos] > 0:
+        pos += 1
+
+    while pos < max_tau - 1:
+        if nsdf[pos] <= 0:
+            pos += 1
+            continue
+
+        max_pos = pos
+        while pos < max_tau - 1 and nsdf[pos] > 0:
+            if nsdf[pos] > nsdf[max_pos]:
+                max_pos = pos
+            pos += 1
+
+        if nsdf[max_pos] > threshold and (best < 0 or nsdf[max_pos] > nsdf[best]):
+            best = max_pos
+
+    return best
+
+
+def parabolic_offset(y0: float, y1: float, y2: float) -> float:
+    """Offset of a parabola's vertex through three equally spaced points.
+
+    Args:
+        y0: Value left of the extremum
+        y1: Value at the extremum
+        y2: Value right of the extremum
+
+    Returns:
+        Vertex offset from the middle point, 0.0 if the points are collinear
+    """
+    denom = 2 * (2 * y1 - y2 - y0)
+    if denom == 0:
+        return 0.0
+    return float((y2 - y0) / denom)
+
+
+# np.correlate already beats a compiled double loop, so only the scans are jitted
+yin_dip = _jit(yin_dip)
+best_key_maximum = _jit(best_key_maximum)
+parabolic_offset = _jit(parabolic_offset)
@@ -2,9 +2,23 @@ from typing import Optional
 
 import numpy as np
 
+from .kernels import (
+    band_products,
+    best_key_maximum,
+    energy_prefix,
+    parabolic_offset,
+    segment_energies,
+)
+from .kernels import nsdf as normalized_square_difference
+from .result import NO_PITCH, PitchResult, clamp_confidence
+from .tracking import LagBands, clip_bands
+
 
 def mpm(
-    signal: np.ndarray, sample_rate: int, threshold: float = 0.1
+    signal: np.ndarray,
+    sample_rate: int,
+    threshold: float = 0.1,
+    lag_bands: Optional[LagBands] = None,
 ) -> Optional[float]:
     """McLeod Pitch Method (MPM) algorithm.
 
@@ -12,81 +26,98 @@ def mpm(
         signal: Audio signal as numpy array
         sample_rate: Sample rate in Hz
         threshold: MPM threshold parameter (default: 0.1)
+        lag_bands: Only search these ``(lo, hi)`` lag ranges (default: all)
 
     Returns:
         Detected frequency in Hz, or None if no pitch detected
     """
-    signal = signal.astype(np.float32)
-    N = len(signal)
-
-    max_tau = N // 2
-
-    nsdf = np.zeros(max_tau)
+    return mpm_result(signal, sample_rate, threshold, lag_bands).frequency
 
-    for tau in range(max_tau):
-        acf = 0
-        divisor_m = 0
-        divisor_tau = 0
 
-        for i in range(N - tau):
-            acf += signal[i] * signal[i + tau]
-            divisor_m += signal[i] ** 2
-            divisor_tau += signal[i + tau] ** 2
+def mpm_result(
+    signal: np.ndarray,
+    sample_rate: int,
+    threshold: float = 0.1,
+    lag_bands: Optional[LagBands] = None,
+) -> PitchResult:
+    """McLeod Pitch Method (MPM) with a confidence score.
 
-        divisor = np.sqrt(divisor_m * divisor_tau)
-        nsdf[tau] = 2 * acf / divisor if divisor > 0 else 0
-
-    key_max_indices = []
-    pos = 0
+    Args:
+        signal: Audio signal as numpy array
+        sample_rate: Sample rate in Hz
+        threshold: MPM threshold parameter (default: 0.1)
+        lag_bands: Only search these ``(lo, hi)`` lag ranges (default: all)
 
-    while pos < max_tau - 1 and nsdf[pos] > 0:
-        pos += 1
+    Returns:
+        PitchResult whose confidence is the chosen NSDF peak, scaled to [0, 1]
+    """
+    signal = signal.astype(np.float32)
+    N = len(signal)
 
-    while pos < max_tau - 1:
-        if nsdf[pos] < 0:
-            pos += 1
-            continue
+    max_tau = N // 2
 
-        max_pos = pos
-        while pos < max_tau - 1 and nsdf[pos] > 0:
-            if nsdf[pos] > nsdf[max_pos]:
-                max_pos = pos
-            pos += 1
+    if lag_bands is not None:
+        return _mpm_bands(
+            signal, sample_rate, threshold, clip_bands(lag_bands, 1, max_tau)
+        )
 
-        if nsdf[max_pos] > threshold:
-            key_max_indices.append(max_pos)
+    nsdf = normalized_square_difference(signal, max_tau)
 
-    if not key_max_indices:
-        return None
+    max_idx = best_key_maximum(nsdf, threshold)
+    if max_idx < 0:
+        return NO_PITCH
 
-    max_idx = key_max_indices[0]
     max_val = nsdf[max_idx]
-
-    for idx in key_max_indices[1:]:
-        if nsdf[idx] > max_val:
-            max_val = nsdf[idx]
-            max_idx = idx
-
     tau = max_idx
 
     x0 = tau - 1 if tau > 0 else tau
     x2 = tau + 1 if tau < max_tau - 1 else tau
 
+    period: float
     if x0 == x2:
         period = tau
     else:
-        y0 = nsdf[x0]
-        y1 = nsdf[tau]
-        y2 = nsdf[x2]
+        period = tau + parabolic_offset(nsdf[x0], nsdf[tau], nsdf[x2])
+
+    if period > 0:
+        frequency = sample_rate / period
+        # This NSDF peaks at 2 for a perfectly periodic frame
+        return PitchResult(frequency, clamp_confidence(max_val / 2))
 
-        a = (y0 - 2 * y1 + y2) / 2
-        b = (y2 - y0) / 2
+    return NO_PITCH
 
-        x_offset = -b / (2 * a) if a != 0 else 0
-        period = tau + x_offset
+
+def _mpm_bands(
+    signal: np.ndarray, sample_rate: int, threshold: float, bands: LagBands
+) -> PitchResult:
+    """MPM restricted to a few lag bands.
+
+    Each band contributes its interior NSDF maximum. The first peak within
+    90% of the best one wins, as in McLeod's original peak picking.
+    """
+    energy = energy_prefix(signal)
+    peaks = []
+
+    for lo, hi in bands:
+        head, tail = segment_energies(energy, lo, hi)
+        divisor = np.sqrt(head * tail)
+        nsdf = np.zeros(hi - lo)
+        voiced = divisor > 0
+        nsdf[voiced] = 2 * band_products(signal, lo, hi)[voiced] / divisor[voiced]
+
+        k = int(np.argmax(nsdf))
+        if 0 < k < len(nsdf) - 1 and nsdf[k] > threshold:
+            peaks.append((lo + k, nsdf[k - 1], nsdf[k], nsdf[k + 1]))
+
+    if not peaks:
+        return NO_PITCH
+
+    best = max(peak[2] for peak in peaks)
+    tau, y0, y1, y2 = next(peak for peak in peaks if peak[2] >= 0.9 * best)
+
+    period = tau + parabolic_offset(y0, y1, y2)
 
     if period > 0:
-        frequency = sample_rate / period
-        return frequency
+        return PitchResult(sample_rate / period, clamp_confidence(y1 / 2))
 
-    return None
+    return NO_PITCH
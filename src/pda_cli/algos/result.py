@@ -0,0 +1,22 @@
+from typing import NamedTuple, Optional
+
+NO_PITCH_CONFIDENCE = 0.0
+
+
+class PitchResult(NamedTuple):
+    """Detected pitch together with a periodicity score.
+
+    ``confidence`` lies in [0, 1]; higher means the frame looked more
+    periodic to the detector. It is 0.0 when no pitch was found.
+    """
+
+    frequency: Optional[float]
+    confidence: float = NO_PITCH_CONFIDENCE
+
+
+NO_PITCH = PitchResult(None)
+
+
+def clamp_confidence(value: float) -> float:
+    """Clamp a raw periodicity score to [0, 1]."""
+    return float(min(1.0, max(0.0, value)))
@@ -0,0 +1,172 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .result import PitchResult
+
+LagBands = List[Tuple[int, int]]
+
+# Detectors that accept a ``lag_bands`` argument
+TRACKABLE = ("acf", "yin", "mpm")
+
+
+def lag_bands(period: float, width: float = 0.05) -> LagBands:
+    """Build lag bands around a period and its octave-check lags.
+
+    Args:
+        period: Previously locked period in samples
+        width: Relative half-width of each band (default: 0.05)
+
+    Returns:
+        Sorted, non-overlapping half-open ``(lo, hi)`` lag ranges around
+        ``period / 2``, ``period`` and ``period * 2``
+    """
+    return _bands_around((period / 2, period, period * 2), width)
+
+
+def submultiple_bands(
+    period: float, width: float = 0.05, count: int = 8
+) -> LagBands:
+    """Build lag bands around ``period / k`` for ``2 <= k <= count``.
+
+    A hit in these bands means a band search landed on a multiple of the
+    true period rather than on the period itself.
+
+    Args:
+        period: Period found by a band search, in samples
+        width: Relative half-width of each band (default: 0.05)
+        count: Largest divisor to cover (default: 8)
+
+    Returns:
+        Sorted, non-overlapping half-open ``(lo, hi)`` lag ranges
+    """
+    centers = [period / k for k in range(count, 1, -1)]
+    return _bands_around(centers, width)
+
+
+def divisor_bands(period: float, width: float = 0.1, count: int = 8) -> LagBands:
+    """Build lag bands around ``period * 2`` and ``period / k`` for k <= count.
+
+    Used to refine a coarse estimate that may have landed on a multiple of
+    the true period, or on half of it.
+
+    Args:
+        period: Estimated period in samples
+        width: Relative half-width of each band (default: 0.1)
+        count: Largest divisor to cover (default: 8)
+
+    Returns:
+        Sorted, non-overlapping half-open ``(lo, hi)`` lag ranges
+    """
+    centers = [period * 2] + [period / k for k in range(1, count + 1)]
+    return _bands_around(sorted(centers), width)
+
+
+def _bands_around(centers: Sequence[float], width: float) -> LagBands:
+    """Merge padded bands around ascending lag centers."""
+    bands: LagBands = []
+    for center in centers:
+        # Pad by a lag on each side so the extremum has neighbours
+        lo = max(1, int(np.floor(center * (1 - width))) - 1)
+        hi = int(np.ceil(center * (1 + width))) + 2
+
+        if bands and lo <= bands[-1][1]:
+            bands[-1] = (bands[-1][0], max(bands[-1][1], hi))
+        else:
+            bands.append((lo, hi))
+
+    return bands
+
+
+def clip_bands(bands: LagBands, tau_min: int, tau_max: int) -> LagBands:
+    """Clip lag bands to a detector's valid lag range.
+
+    Args:
+        bands: Half-open ``(lo, hi)`` lag ranges
+        tau_min: Smallest valid lag
+        tau_max: One past the largest valid lag
+
+    Returns:
+        Clipped bands, dropping any too narrow to hold an interior extremum
+    """
+    clipped = []
+    for lo, hi in bands:
+        lo = max(lo, tau_min)
+        hi = min(hi, tau_max)
+        if hi - lo >= 3:
+            clipped.append((lo, hi))
+    return clipped
+
+
+class PitchTracker:
+    """Narrow lag search around the last locked pitch.
+
+    Once a pitch is locked the detector only evaluates lags near the previous
+    period and its octave neighbours. A miss, a low-confidence hit, or a hit
+    that turns out to be a multiple of a shorter period falls back to a full
+    search on the same frame. Every hit is checked against its divisors up
+    to ``submultiples``, since after a jump to a near-odd multiple of the old
+    pitch the old period is itself a multiple of the new one. Every
+    ``verify_every`` frames a full search runs anyway, catching multiples
+    beyond that.
+    """
+
+    def __init__(
+        self,
+        detector: Callable[..., PitchResult],
+        width: float = 0.05,
+        min_confidence: float = 0.5,
+        submultiples: int = 8,
+        verify_every: int = 16,
+    ):
+        self.detector = detector
+        self.width = width
+        self.min_confidence = min_confidence
+        self.submultiples = submultiples
+        self.verify_every = verify_every
+        self.period: Optional[float] = None
+        self.tracked = 0
+        self.full = 0
+        self._since_full = 0
+
+    def detect(self, signal: np.ndarray, sample_rate: int) -> PitchResult:
+        """Detect pitch, searching narrowly when locked.
+
+        Args:
+            signal: Audio signal as numpy array
+            sample_rate: Sample rate in Hz
+
+        Returns:
+            PitchResult from the narrow or the full search
+        """
+        if self.period is not None and self._since_full < self.verify_every:
+            bands = lag_bands(self.period, self.width)
+            result = self.detector(signal, sample_rate, lag_bands=bands)
+            if result.frequency and result.confidence >= self.min_confidence:
+                period = sample_rate / result.frequency
+                if not self._is_multiple(signal, sample_rate, period, result):
+                    self.tracked += 1
+                    self._since_full += 1
+                    self.period = period
+                    return result
+
+        self.full += 1
+        self._since_full = 0
+        result = self.detector(signal, sample_rate)
+        self.period = sample_rate / result.frequency if result.frequency else None
+        return result
+
+    def _is_multiple(
+        self,
+        signal: np.ndarray,
+        sample_rate: int,
+        period: float,
+        result: PitchResult,
+    ) -> bool:
+        bands = submultiple_bands(period, self.width, self.submultiples)
+        shorter = self.detector(signal, sample_rate, lag_bands=bands)
+        return shorter.confidence >= 0.9 * result.confidence
+
+    def reset(self) -> None:
+        """Drop the lock so the next frame does a full search."""
+        self.period = None
@@ -2,9 +2,23 @@ from typing import Optional
 
 import numpy as np
 
+from .kernels import (
+    band_products,
+    difference,
+    energy_prefix,
+    parabolic_offset,
+    segment_energies,
+    yin_dip,
+)
+from .result import NO_PITCH, PitchResult, clamp_confidence
+from .tracking import LagBands, clip_bands
+
 
 def yin(
-    signal: np.ndarray, sample_rate: int, threshold: float = 0.1
+    signal: np.ndarray,
+    sample_rate: int,
+    threshold: float = 0.1,
+    lag_bands: Optional[LagBands] = None,
 ) -> Optional[float]:
     """YIN pitch detection algorithm.
 
@@ -12,46 +26,57 @@ def yin(
         signal: Audio signal as numpy array
         sample_rate: Sample rate in Hz
         threshold: YIN threshold parameter (default: 0.1)
+        lag_bands: Only search these ``(lo, hi)`` lag ranges (default: all)
 
     Returns:
         Detected frequency in Hz, or None if no pitch detected
     """
+    return yin_result(signal, sample_rate, threshold, lag_bands).frequency
+
+
+def yin_result(
+    signal: np.ndarray,
+    sample_rate: int,
+    threshold: float = 0.1,
+    lag_bands: Optional[LagBands] = None,
+) -> PitchResult:
+    """YIN pitch detection with a confidence score.
+
+    Args:
+        signal: Audio signal as numpy array
+        sample_rate: Sample rate in Hz
+        threshold: YIN threshold parameter (default: 0.1)
+        lag_bands: Only search these ``(lo, hi)`` lag ranges (default: all)
+
+    Returns:
+        PitchResult whose confidence is one minus the CMNDF dip
+    """
     signal = signal.astype(np.float32)
     W = len(signal)
     tau_max = min(W // 2, int(sample_rate / 50))  # Cap at 50Hz minimum
 
-    df = np.zeros(tau_max)
-
-    for tau in range(1, tau_max):
-        for j in range(0, W - tau):
-            df[tau] += (signal[j] - signal[j + tau]) ** 2
+    if lag_bands is not None:
+        return _yin_bands(
+            signal, sample_rate, threshold, clip_bands(lag_bands, 1, tau_max)
+        )
 
-    cmndf = df.copy()
-    cmndf[0] = 1
+    df = difference(signal, tau_max)
 
-    cumulative = np.cumsum(df[1:], dtype=np.float32)
+    cmndf = np.ones(tau_max)
+    cumulative = np.cumsum(df[1:])
+    taus = np.arange(1, tau_max)
+    voiced = cumulative > 0
+    cmndf[1:][voiced] = df[1:][voiced] * taus[voiced] / cumulative[voiced]
 
-    for tau in range(1, tau_max):
-        denom_sum = cumulative[tau - 1] if tau - 1 < len(cumulative) else cumulative[-1]
-        if denom_sum > 0:
-            cmndf[tau] = df[tau] * tau / denom_sum
-        else:
-            cmndf[tau] = 1
-
-    tau = 1
-    while tau < tau_max - 1:
-        if cmndf[tau] < threshold:
-            while tau + 1 < tau_max and cmndf[tau + 1] < cmndf[tau]:
-                tau += 1
-            break
-        tau += 1
+    tau = yin_dip(cmndf, threshold)
 
     if tau == tau_max - 1 or cmndf[tau] >= threshold:
-        return None
+        return NO_PITCH
 
     x0 = tau - 1 if tau > 0 else tau
     x2 = tau + 1 if tau < tau_max - 1 else tau
 
+    period: float
     if x0 == tau:
         if cmndf[tau] <= cmndf[x2]:
             period = tau
@@ -63,11 +88,41 @@ def yin(
         else:
             period = x0
     else:
-        s0 = cmndf[x0]
-        s1 = cmndf[tau]
-        s2 = cmndf[x2]
-
-        period = tau + (s2 - s0) / (2 * (2 * s1 - s2 - s0))
+        period = tau + parabolic_offset(cmndf[x0], cmndf[tau], cmndf[x2])
 
     frequency = sample_rate / period
-    return frequency
+    return PitchResult(frequency, clamp_confidence(1 - cmndf[tau]))
+
+
+def _yin_bands(
+    signal: np.ndarray, sample_rate: int, threshold: float, bands: LagBands
+) -> PitchResult:
+    """YIN restricted to a few lag bands.
+
+    The cumulative mean normalization needs every lag below tau, so it is
+    replaced by the energy of the two overlapping segments. Near the period
+    of a zero-mean signal the two agree.
+    """
+    energy = energy_prefix(signal)
+
+    for lo, hi in bands:
+        head, tail = segment_energies(energy, lo, hi)
+        total = head + tail
+        diff = np.maximum(total - 2 * band_products(signal, lo, hi), 0.0)
+        cmndf = np.ones(hi - lo)
+        voiced = total > 0
+        cmndf[voiced] = diff[voiced] / total[voiced]
+
+        k = yin_dip(cmndf, threshold)
+
+        # The dip must be a real minimum, not a slope cut by the band edge
+        if k >= len(cmndf) - 1 or cmndf[k] >= threshold:
+            continue
+        if cmndf[k - 1] < cmndf[k]:
+            continue
+
+        period = lo + k + parabolic_offset(cmndf[k - 1], cmndf[k], cmndf[k + 1])
+
+        return PitchResult(sample_rate / period, clamp_confidence(1 - cmndf[k]))
+
+    return NO_PITCH
@@ -2,6 +2,8 @@ from typing import Optional
 
 import numpy as np
 
+from .result import NO_PITCH, PitchResult, clamp_confidence
+
 
 def zero_crossing_rate(signal: np.ndarray, sample_rate: int) -> Optional[float]:
     """Zero-crossing rate pitch detection.
@@ -13,17 +15,34 @@ def zero_crossing_rate(signal: np.ndarray, sample_rate: int) -> Optional[float]:
     Returns:
         Detected frequency in Hz, or None if no pitch detected
     """
+    return zero_crossing_rate_result(signal, sample_rate).frequency
+
+
+def zero_crossing_rate_result(signal: np.ndarray, sample_rate: int) -> PitchResult:
+    """Zero-crossing rate pitch detection with a confidence score.
+
+    Args:
+        signal: Audio signal as numpy array
+        sample_rate: Sample rate in Hz
+
+    Returns:
+        PitchResult whose confidence reflects how evenly spaced the zero
+        crossings are
+    """
     signal = signal - np.mean(signal)
 
     zero_crossings = np.where(np.diff(np.sign(signal)))[0]
 
     if len(zero_crossings) < 2:
-        return None
+        return NO_PITCH
 
-    avg_distance = np.mean(np.diff(zero_crossings))
+    distances = np.diff(zero_crossings)
+    avg_distance = np.mean(distances)
 
     if avg_distance > 0:
         frequency = sample_rate / (2 * avg_distance)
-        return frequency
+        # Noise and extra crossings from strong harmonics make spacing uneven
+        regularity = 1 - np.std(distances) / avg_distance
+        return PitchResult(frequency, clamp_confidence(regularity))
 
-    return None
+    return NO_PITCH
@@ -1,24 +1,104 @@
 import csv
 import sys
+import time
 from typing import Any, Optional
 
 import click
 import numpy as np
-import sounddevice as sd
 
-from .algos import ALGORITHMS
-from .utils import AmplitudeGate, PitchSmoother, format_note
+from .algos import CASCADE_FINAL, DETECTORS, TRACKABLE, PitchTracker, build_cascade
+from .algos.kernels import JIT_AVAILABLE
+from .replay import ReplayStream, load_source
+from .utils import AmplitudeGate, Autotuner, PitchSmoother, format_note, frame_rms
+
+
+def _parse_frames(
+    ctx: click.Context, param: click.Parameter, value: str
+) -> Optional[int]:
+    """Accept a positive sample count, or "auto" (returned as None)."""
+    if value == "auto":
+        return None
+    try:
+        frames = int(value)
+    except ValueError:
+        raise click.BadParameter("expected a sample count or 'auto'") from None
+    if frames <= 0:
+        raise click.BadParameter("must be positive")
+    return frames
+
+
+def _make_tuner(headroom: float) -> Autotuner:
+    """Autotuner covering every detector and worst-case cascade."""
+    detectors = dict(DETECTORS)
+    for final in CASCADE_FINAL:
+        # A confidence above 1 is never reached, so every stage runs
+        detectors[f"cascade-{final}"] = build_cascade(final, 2.0).detect
+    return Autotuner(detectors, headroom=headroom, jit=JIT_AVAILABLE)
+
+
+def _auto_frames(tuner: Autotuner, name: str, sample_rate: int, fmin: float) -> int:
+    """Pick and announce a frame size from the (cached) calibration."""
+    frames = tuner.recommend(name, sample_rate, fmin)
+    if frames is None:
+        frames = min(
+            tuner.candidates(sample_rate, fmin),
+            key=lambda n: tuner.load(name, sample_rate, n),
+        )
+        print(
+            f"Warning: no frame size keeps {tuner.headroom:g}x headroom, "
+            f"using the lightest ({frames})",
+            file=sys.stderr,
+        )
+    tuner.save()
+
+    load = tuner.load(name, sample_rate, frames)
+    print(f"Auto frame size: {frames} samples ({load * 100:.1f}% of each block)")
+    return frames
 
 
 @click.command()
 @click.option(
     "--algo",
     default="yin",
-    type=click.Choice(["zcr", "acf", "yin", "mpm"]),
+    type=click.Choice(["zcr", "acf", "yin", "mpm", "cascade"]),
     help="Pitch detection algorithm",
 )
+@click.option(
+    "--cascade-to",
+    default="yin",
+    type=click.Choice(list(CASCADE_FINAL)),
+    help="Detector the cascade escalates to",
+)
+@click.option(
+    "--min-confidence",
+    default=0.9,
+    type=float,
+    help="Confidence a cascade stage needs to answer (0-1)",
+)
 @click.option("--sr", default=48000, type=int, help="Sample rate (Hz)")
-@click.option("--frames", default=2048, type=int, help="Window length (samples)")
+@click.option(
+    "--frames",
+    default="2048",
+    callback=_parse_frames,
+    help="Window length (samples), or 'auto' to pick from the calibration",
+)
+@click.option(
+    "--fmin",
+    default=50.0,
+    type=float,
+    help="Lowest pitch to detect (Hz), bounds the window for --frames auto",
+)
+@click.option(
+    "--headroom",
+    default=4.0,
+    type=float,
+    help="Required ratio of block duration to detection time",
+)
+@click.option(
+    "--tune",
+    is_flag=True,
+    help="Benchmark every detector on this host, cache and print the results",
+)
 @click.option("--device", default=None, type=str, help="Audio device name/id")
 @click.option("--list-devices", is_flag=True, help="List available audio devices")
 @click.option(
@@ -33,13 +113,53 @@ from .utils import AmplitudeGate, PitchSmoother, format_note
     "--gate", default=0.005, type=float, help="Amplitude gate threshold (RMS)"
 )
 @click.option("--log", type=click.Path(), help="Log results to CSV file")
+@click.option(
+    "--replay",
+    type=str,
+    help="Feed a WAV file or 'sine:FREQ[:SECONDS]' through the live pipeline",
+)
+@click.option(
+    "--replay-fast",
+    is_flag=True,
+    help="Deliver replay blocks as fast as possible instead of in real time",
+)
+@click.option(
+    "--replay-jitter",
+    default=0.0,
+    type=float,
+    help="Random extra delay per replay block, up to this many ms",
+)
+@click.option(
+    "--replay-stall-every",
+    default=0,
+    type=int,
+    help="Stall every Nth replay block (0 to disable)",
+)
+@click.option(
+    "--replay-stall-ms", default=50.0, type=float, help="Length of each stall (ms)"
+)
+@click.option(
+    "--replay-report",
+    type=click.Path(),
+    help="Write per-block replay timings to CSV",
+)
+@click.option(
+    "--track",
+    is_flag=True,
+    help="Search only near the locked pitch (acf, yin, mpm)",
+)
 @click.option(
     "--update-rate", default=10, type=int, help="Display updates per second (Hz)"
 )
 def main(
     algo: str,
+    cascade_to: str,
+    min_confidence: float,
     sr: int,
-    frames: int,
+    frames: Optional[int],
+    fmin: float,
+    headroom: float,
+    tune: bool,
     device: Optional[str],
     list_devices: bool,
     file: Optional[str],
@@ -48,20 +168,56 @@ def main(
     smooth: int,
     gate: float,
     log: Optional[str],
+    replay: Optional[str],
+    replay_fast: bool,
+    replay_jitter: float,
+    replay_stall_every: int,
+    replay_stall_ms: float,
+    replay_report: Optional[str],
+    track: bool,
     update_rate: int,
 ) -> None:
     """Real-time pitch detection CLI."""
     if list_devices:
+        import sounddevice as sd
+
         print(sd.query_devices())
         return
 
-    pitch_func = ALGORITHMS[algo]
+    if tune:
+        tuner = _make_tuner(headroom)
+        tuner.timings.clear()
+
+        print(f"Calibrating at {sr} Hz for pitches down to {fmin:g} Hz")
+        print(f"Target: detection within 1/{headroom:g} of each block\n")
+        print(f"{'algorithm':<12} {'frames':>6} {'ms/block':>9} {'load':>7}")
+        for name in tuner.detectors:
+            best = tuner.recommend(name, sr, fmin)
+            for n in tuner.candidates(sr, fmin):
+                cost = tuner.cost(name, sr, n) * 1000
+                load = tuner.load(name, sr, n) * 100
+                mark = "  <- recommended" if n == best else ""
+                print(f"{name:<12} {n:>6} {cost:>9.3f} {load:>6.1f}%{mark}")
+
+        tuner.save()
+        print(f"\nSaved calibration to {tuner.cache_file}")
+        return
+
+    if track and algo not in TRACKABLE:
+        raise click.UsageError(f"--track requires one of: {', '.join(TRACKABLE)}")
+
+    cascade = build_cascade(cascade_to, min_confidence) if algo == "cascade" else None
+    detect = cascade.detect if cascade else DETECTORS[algo]
+    tracker = PitchTracker(detect) if track else None
+    if tracker:
+        detect = tracker.detect
+
+    tune_name = f"cascade-{cascade_to}" if cascade else algo
 
     if file:
         import wave
 
         print(f"Processing file: {file}")
-        print(f"Algorithm: {algo.upper()}, Frame size: {frames} samples\n")
 
         try:
             with wave.open(file, "rb") as wav:
@@ -69,23 +225,73 @@ def main(
                 wav_frames = wav.getnframes()
                 wav_data = wav.readframes(wav_frames)
 
+                if frames is None:
+                    tuner = _make_tuner(headroom)
+                    frames = _auto_frames(tuner, tune_name, wav_sr, fmin)
+                print(f"Algorithm: {algo.upper()}, Frame size: {frames} samples\n")
+
                 signal = (
                     np.frombuffer(wav_data, dtype=np.int16).astype(np.float32) / 32768.0
                 )
 
-                for i in range(0, len(signal) - frames, frames // 2):
-                    window = signal[i : i + frames]
-                    pitch = pitch_func(window, wav_sr)
+                # Gate every hop up front so silent frames never reach the detector
+                hop = frames // 2
+                active = AmplitudeGate(min_rms=gate).process_all(
+                    frame_rms(signal, frames, hop)
+                )
+                quiet_since = None
 
+                for i, is_active in zip(range(0, len(signal) - frames, hop), active):
                     time_pos = i / wav_sr
+
+                    if not is_active:
+                        if quiet_since is None:
+                            quiet_since = time_pos
+                            if tracker:
+                                tracker.reset()
+                        continue
+
+                    if quiet_since is not None:
+                        print(f"{quiet_since:6.2f}s: quiet until {time_pos:.2f}s")
+                        quiet_since = None
+
+                    window = signal[i : i + frames]
+                    pitch = detect(window, wav_sr).frequency
+
                     if pitch and 50 <= pitch <= 2000:
                         note_str = format_note(pitch, show_cents=not no_cents)
                         print(f"{time_pos:6.2f}s: {pitch:7.2f} Hz  {note_str}")
+
+                if quiet_since is not None:
+                    print(f"{quiet_since:6.2f}s: quiet until end")
+
+                skipped = int(np.count_nonzero(~active))
+                print(
+                    f"\nSkipped {skipped} of {len(active)} frames as quiet "
+                    f"(gate {gate})"
+                )
+                if tracker:
+                    print(
+                        f"\nTracking: {tracker.tracked} narrow, "
+                        f"{tracker.full} full searches"
+                    )
+                if cascade:
+                    print(f"\n{cascade.summary()}")
         except Exception as e:
             print(f"Error reading file: {e}", file=sys.stderr)
             sys.exit(1)
         return
 
+    replay_signal = None
+    if replay:
+        try:
+            replay_signal, sr = load_source(replay, sr)
+        except Exception as e:
+            raise click.BadParameter(str(e), param_hint="--replay") from None
+
+    if frames is None:
+        frames = _auto_frames(_make_tuner(headroom), tune_name, sr, fmin)
+
     # Initialize smoothing and gating
     smoother = PitchSmoother(window_size=smooth) if smooth > 0 else None
     amp_gate = AmplitudeGate(min_rms=gate)
@@ -96,7 +302,9 @@ def main(
     if log:
         log_file = open(log, "w", newline="")
         log_writer = csv.writer(log_file)
-        log_writer.writerow(["timestamp", "frequency_hz", "note", "rms", "algorithm"])
+        log_writer.writerow(
+            ["timestamp", "frequency_hz", "note", "rms", "algorithm", "confidence"]
+        )
 
     # Display rate limiting
     last_display_time = 0
@@ -106,14 +314,20 @@ def main(
     print(f"Sample rate: {sr} Hz, Frame size: {frames} samples")
     if smooth > 0:
         print(f"Smoothing: {smooth} samples, Gate threshold: {gate}")
+    if cascade:
+        stages = " -> ".join(name for name, _ in cascade.stages)
+        print(f"Cascade: {stages}, min confidence {min_confidence}")
+    if tracker:
+        print("Tracking: narrow lag search once locked")
     print(f"Display rate: {update_rate} Hz")
     if log:
         print(f"Logging to: {log}")
+    if replay:
+        pace = "as fast as possible" if replay_fast else "in real time"
+        print(f"Replaying: {replay} {pace}")
     print("Press Ctrl+C to stop\n")
 
-    def audio_callback(
-        indata: np.ndarray, frames: int, time: Any, status: Optional[sd.CallbackFlags]
-    ) -> None:
+    def audio_callback(indata: np.ndarray, frames: int, time: Any, status: Any) -> None:
         nonlocal last_display_time
         import time as time_module
 
@@ -123,7 +337,9 @@ def main(
 
         if status:
             if log_writer:
-                log_writer.writerow([audio_time, None, None, None, f"ERROR: {status}"])
+                log_writer.writerow(
+                    [audio_time, None, None, None, f"ERROR: {status}", None]
+                )
 
             # Rate limit error display too
             if current_time - last_display_time >= display_interval:
@@ -144,16 +360,22 @@ def main(
         if not amp_gate.process(rms):
             if smoother:
                 smoother.reset()
+            if tracker:
+                tracker.reset()
 
             if log_writer:
-                log_writer.writerow([audio_time, None, "quiet", f"{rms:.6f}", algo])
+                log_writer.writerow(
+                    [audio_time, None, "quiet", f"{rms:.6f}", algo, None]
+                )
 
             if current_time - last_display_time >= display_interval:
                 print(f"\r{'---.--':>7} Hz  {'---':>8} (quiet)", end="", flush=True)
                 last_display_time = current_time
             return
 
-        pitch = pitch_func(signal, sr)
+        result = detect(signal, sr)
+        pitch = result.frequency
+        confidence = f"{result.confidence:.3f}"
 
         # Apply smoothing if enabled
         if smoother and pitch:
@@ -161,7 +383,14 @@ def main(
             if not pitch:  # Not enough stable samples yet
                 if log_writer:
                     log_writer.writerow(
-                        [audio_time, None, "stabilizing", f"{rms:.6f}", algo]
+                        [
+                            audio_time,
+                            None,
+                            "stabilizing",
+                            f"{rms:.6f}",
+                            algo,
+                            confidence,
+                        ]
                     )
 
                 if current_time - last_display_time >= display_interval:
@@ -175,7 +404,14 @@ def main(
 
             if log_writer:
                 log_writer.writerow(
-                    [audio_time, f"{pitch:.2f}", note_str, f"{rms:.6f}", algo]
+                    [
+                        audio_time,
+                        f"{pitch:.2f}",
+                        note_str,
+                        f"{rms:.6f}",
+                        algo,
+                        confidence,
+                    ]
                 )
 
             if current_time - last_display_time >= display_interval:
@@ -190,6 +426,7 @@ def main(
                         "out_of_range",
                         f"{rms:.6f}",
                         algo,
+                        confidence,
                     ]
                 )
 
@@ -197,26 +434,55 @@ def main(
                 print(f"\r{'---.--':>7} Hz  {'---':>8}", end="", flush=True)
                 last_display_time = current_time
 
+    stream: Any = None
     try:
-        # Add buffer and latency settings to prevent overflow
-        with sd.InputStream(
-            callback=audio_callback,
-            channels=1,
-            samplerate=sr,
-            blocksize=frames,
-            device=device,
-            latency=0.1,
-        ):
+        if replay_signal is not None:
+            stream = ReplayStream(
+                audio_callback,
+                replay_signal,
+                samplerate=sr,
+                blocksize=frames,
+                realtime=not replay_fast,
+                jitter=replay_jitter / 1000,
+                stall_every=replay_stall_every,
+                stall=replay_stall_ms / 1000,
+                latency=0.1,
+            )
+        else:
+            # Imported here so replay runs on hosts without PortAudio
+            import sounddevice as sd
+
+            # Add buffer and latency settings to prevent overflow
+            stream = sd.InputStream(
+                callback=audio_callback,
+                channels=1,
+                samplerate=sr,
+                blocksize=frames,
+                device=device,
+                latency=0.1,
+            )
+
+        with stream:
             print("Listening... (whistle or play a note)")
             print("(You should see 'quiet' if no sound detected)")
-            while True:
-                sd.sleep(100)
+            while stream.active:
+                time.sleep(0.1)
+        print("\n\nReplay finished." if replay else "\n\nStream stopped.")
     except KeyboardInterrupt:
         print("\n\nStopped.")
     except Exception as e:
         print(f"\nError: {e}", file=sys.stderr)
         sys.exit(1)
     finally:
+        if tracker:
+            print(f"Tracking: {tracker.tracked} narrow, {tracker.full} full searches")
+        if cascade:
+            print(cascade.summary())
+        if isinstance(stream, ReplayStream):
+            print(stream.stats.summary())
+            if replay_report:
+                stream.stats.write_csv(replay_report)
+                print(f"Replay report saved to: {replay_report}")
         if log_file:
             log_file.close()
             print(f"\nLog saved to: {log}")
@@ -0,0 +1,243 @@
+import csv
+import random
+import threading
+import time
+import wave
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class ReplayTime(NamedTuple):
+    """Stand-in for the time info PortAudio passes to stream callbacks."""
+
+    inputBufferAdcTime: float
+    currentTime: float
+
+
+class ReplayStatus:
+    """Truthy callback status reporting an input overflow."""
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __str__(self) -> str:
+        return "input overflow"
+
+
+class BlockTiming(NamedTuple):
+    """Timing of one delivered block, in seconds since the replay started."""
+
+    block: int
+    due: float  # when the block's last sample would have been captured
+    delivered: float  # when the callback was entered
+    finished: float  # when the callback returned
+    overflow: bool
+
+    @property
+    def latency(self) -> float:
+        return self.finished - self.due
+
+
+class ReplayStats:
+    """Per-block deadlines, latency and throughput of a replay."""
+
+    def __init__(self, block_duration: float):
+        self.block_duration = block_duration
+        self.blocks: List[BlockTiming] = []
+        self.dropped = 0
+        self.wall_time = 0.0
+
+    @property
+    def deadline_misses(self) -> int:
+        """Blocks still being processed when the next one was due."""
+        return sum(1 for b in self.blocks if b.finished > b.due + self.block_duration)
+
+    @property
+    def overflows(self) -> int:
+        return sum(1 for b in self.blocks if b.overflow)
+
+    def latency_percentile(self, q: float) -> float:
+        """End-to-end latency percentile in seconds (0 if nothing ran)."""
+        if not self.blocks:
+            return 0.0
+        return float(np.percentile([b.latency for b in self.blocks], q))
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio processed per second of wall time."""
+        if self.wall_time <= 0:
+            return 0.0
+        return len(self.blocks) * self.block_duration / self.wall_time
+
+    def summary(self) -> str:
+        """Multi-line human-readable report."""
+        return "\n".join(
+            [
+                f"Blocks: {len(self.blocks)} delivered, {self.dropped} dropped, "
+                f"{self.overflows} overflows, {self.deadline_misses} deadline misses",
+                f"Latency: p50 {self.latency_percentile(50) * 1000:.2f} ms, "
+                f"p95 {self.latency_percentile(95) * 1000:.2f} ms, "
+                f"max {self.latency_percentile(100) * 1000:.2f} ms",
+                f"Throughput: {self.realtime_factor:.1f}x real time",
+            ]
+        )
+
+    def write_csv(self, path: str) -> None:
+        """Write one row per delivered block."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                [
+                    "block",
+                    "due",
+                    "delivered",
+                    "finished",
+                    "latency",
+                    "missed",
+                    "overflow",
+                ]
+            )
+            for b in self.blocks:
+                missed = b.finished > b.due + self.block_duration
+                writer.writerow(
+                    [
+                        b.block,
+                        f"{b.due:.6f}",
+                        f"{b.delivered:.6f}",
+                        f"{b.finished:.6f}",
+                        f"{b.latency:.6f}",
+                        int(missed),
+                        int(b.overflow),
+                    ]
+                )
+
+
+def load_source(source: str, sample_rate: int) -> Tuple[np.ndarray, int]:
+    """Load a replay signal.
+
+    Args:
+        source: Path to a 16-bit mono WAV file, or ``sine:FREQ[:SECONDS]``
+        sample_rate: Sample rate for synthetic sources in Hz
+
+    Returns:
+        Tuple of (signal, sample_rate)
+    """
+    if source.startswith("sine:"):
+        parts = source.split(":")
+        frequency = float(parts[1])
+        duration = float(parts[2]) if len(parts) > 2 else 5.0
+        t = np.arange(int(duration * sample_rate)) / sample_rate
+        tone = 0.5 * np.sin(2 * np.pi * frequency * t)
+        return tone.astype(np.float32), sample_rate
+
+    with wave.open(source, "rb") as wav:
+        wav_sr = wav.getframerate()
+        wav_data = wav.readframes(wav.getnframes())
+
+    signal = np.frombuffer(wav_data, dtype=np.int16).astype(np.float32) / 32768.0
+    return signal, wav_sr
+
+
+class ReplayStream:
+    """Replays a signal through an ``sd.InputStream``-style callback.
+
+    Blocks are delivered from a background thread, either at wall-clock pace
+    or as fast as the callback returns. In paced mode, optional jitter and
+    periodic stalls delay deliveries. A block delivered more than ``latency``
+    seconds late is flagged as an input overflow and the backlog is dropped,
+    as PortAudio does when the callback cannot keep up.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[np.ndarray, int, Any, Any], None],
+        signal: np.ndarray,
+        samplerate: int,
+        blocksize: int,
+        realtime: bool = True,
+        jitter: float = 0.0,
+        stall_every: int = 0,
+        stall: float = 0.0,
+        latency: float = 0.1,
+        seed: Optional[int] = None,
+    ):
+        self.callback = callback
+        self.signal = signal.astype(np.float32)
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.realtime = realtime
+        self.jitter = jitter
+        self.stall_every = stall_every
+        self.stall = stall
+        self.latency = latency
+        self.stats = ReplayStats(blocksize / samplerate)
+        self._random = random.Random(seed)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def active(self) -> bool:
+        """True while blocks are still being delivered."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self) -> "ReplayStream":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self._error:
+            raise self._error
+
+    def _run(self) -> None:
+        n_blocks = len(self.signal) // self.blocksize
+        block_duration = self.stats.block_duration
+        start = time.perf_counter()
+        k = 0
+
+        try:
+            while k < n_blocks and not self._stop.is_set():
+                if self.realtime:
+                    due = (k + 1) * block_duration
+                    delay = self._random.uniform(0, self.jitter)
+                    if self.stall_every and (k + 1) % self.stall_every == 0:
+                        delay += self.stall
+                    wait = start + due + delay - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+                else:
+                    due = time.perf_counter() - start
+
+                delivered = time.perf_counter() - start
+                overflow = self.realtime and delivered - due > self.latency
+
+                block = self.signal[k * self.blocksize : (k + 1) * self.blocksize]
+                self.callback(
+                    block.reshape(-1, 1),
+                    self.blocksize,
+                    ReplayTime(k * block_duration, delivered),
+                    ReplayStatus() if overflow else None,
+                )
+
+                finished = time.perf_counter() - start
+                self.stats.blocks.append(
+                    BlockTiming(k, due, delivered, finished, overflow)
+                )
+
+                k += 1
+                if overflow:
+                    # Skip to the newest block that has fully arrived
+                    newest = int(finished / block_duration) - 1
+                    if newest > k:
+                        skipped = min(newest, n_blocks) - k
+                        self.stats.dropped += skipped
+                        k += skipped
+        except BaseException as e:  # surfaced from __exit__
+            self._error = e
+        finally:
+            self.stats.wall_time = time.perf_counter() - start
@@ -1,4 +1,13 @@
 from .notes import format_note, freq_to_note
-from .smoothing import AmplitudeGate, PitchSmoother
+from .smoothing import AmplitudeGate, PitchSmoother, frame_rms
+from .tuning import Autotuner, min_frames
 
-__all__ = ["freq_to_note", "format_note", "PitchSmoother", "AmplitudeGate"]
+__all__ = [
+    "freq_to_note",
+    "format_note",
+    "PitchSmoother",
+    "AmplitudeGate",
+    "frame_rms",
+    "Autotuner",
+    "min_frames",
+]
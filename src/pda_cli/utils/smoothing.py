@@ -69,3 +69,33 @@ class AmplitudeGate:
                 self.gate_open = True
 
         return self.gate_open
+
+    def process_all(self, rms: np.ndarray) -> np.ndarray:
+        """Run the gate over a sequence of frame RMS values.
+
+        Args:
+            rms: RMS amplitude of each frame, in order
+
+        Returns:
+            Boolean mask, True for frames that should be processed
+        """
+        return np.array([self.process(float(value)) for value in rms], dtype=bool)
+
+
+def frame_rms(signal: np.ndarray, frame_size: int, hop: int) -> np.ndarray:
+    """RMS of every hop-spaced frame, from one cumulative sum of squares.
+
+    Args:
+        signal: Audio signal as numpy array
+        frame_size: Frame length in samples
+        hop: Distance between frame starts in samples
+
+    Returns:
+        RMS of the frames starting at ``range(0, len(signal) - frame_size, hop)``
+    """
+    starts = np.arange(0, len(signal) - frame_size, hop)
+    # float64 keeps the running sum exact enough over long recordings
+    squares = np.concatenate(([0.0], np.cumsum(signal.astype(np.float64) ** 2)))
+    energy = squares[starts + frame_size] - squares[starts]
+    rms: np.ndarray = np.sqrt(np.maximum(energy, 0) / frame_size)
+    return rms
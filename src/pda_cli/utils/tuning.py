@@ -0,0 +1,152 @@
+import json
+import math
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .. import __version__
+
+CANDIDATE_FRAMES = (256, 512, 1024, 2048, 4096, 8192)
+
+
+def min_frames(sample_rate: int, fmin: float) -> int:
+    """Shortest window that holds two periods of the lowest pitch.
+
+    Args:
+        sample_rate: Sample rate in Hz
+        fmin: Lowest frequency to detect in Hz
+
+    Returns:
+        Minimum window length in samples
+    """
+    return int(math.ceil(2 * sample_rate / fmin))
+
+
+def default_cache_file() -> Path:
+    """Per-host calibration cache under the user cache directory."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pda-cli" / f"tune-{socket.gethostname()}.json"
+
+
+class Autotuner:
+    """Microbenchmarks detectors and picks frame sizes for real-time use.
+
+    Timings are keyed by detector, sample rate and frame size, and cached per
+    host so later launches skip the measurements. The cache is discarded when
+    the package version or JIT availability changes.
+    """
+
+    def __init__(
+        self,
+        detectors: Mapping[str, Callable[[np.ndarray, int], object]],
+        headroom: float = 4.0,
+        cache_file: Optional[Path] = None,
+        repeats: int = 5,
+        jit: bool = False,
+    ):
+        self.detectors = detectors
+        self.headroom = headroom
+        self.cache_file = cache_file or default_cache_file()
+        self.repeats = repeats
+        self.jit = jit
+        self.timings: Dict[str, float] = self._load()
+
+    def _load(self) -> Dict[str, float]:
+        try:
+            data = json.loads(self.cache_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+        if data.get("version") != __version__ or data.get("jit") != self.jit:
+            return {}
+        return dict(data.get("timings", {}))
+
+    def save(self) -> None:
+        """Write the timings to the cache file."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": __version__, "jit": self.jit, "timings": self.timings}
+        self.cache_file.write_text(json.dumps(data, indent=2, sort_keys=True))
+
+    def cost(self, algo: str, sample_rate: int, frames: int) -> float:
+        """Median seconds one detector call takes on this host.
+
+        Args:
+            algo: Detector name
+            sample_rate: Sample rate in Hz
+            frames: Window length in samples
+
+        Returns:
+            Seconds per call, measured once and then served from the cache
+        """
+        key = f"{algo}/{sample_rate}/{frames}"
+        if key not in self.timings:
+            self.timings[key] = self._measure(self.detectors[algo], sample_rate, frames)
+        return self.timings[key]
+
+    def _measure(
+        self,
+        detector: Callable[[np.ndarray, int], object],
+        sample_rate: int,
+        frames: int,
+    ) -> float:
+        t = np.arange(frames) / sample_rate
+        noise = np.random.default_rng(0).normal(0, 0.05, frames)
+        signal = (0.5 * np.sin(2 * np.pi * 220 * t) + noise).astype(np.float32)
+
+        # Warm-up call absorbs JIT compilation and cache effects
+        detector(signal, sample_rate)
+
+        samples = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            detector(signal, sample_rate)
+            samples.append(time.perf_counter() - start)
+        return float(np.median(samples))
+
+    def load(self, algo: str, sample_rate: int, frames: int) -> float:
+        """Fraction of each block's duration spent detecting.
+
+        Args:
+            algo: Detector name
+            sample_rate: Sample rate in Hz
+            frames: Window length in samples
+
+        Returns:
+            Real-time factor; 1.0 means detection takes a whole block
+        """
+        return self.cost(algo, sample_rate, frames) * sample_rate / frames
+
+    def candidates(
+        self, sample_rate: int, fmin: float, frames: Sequence[int] = CANDIDATE_FRAMES
+    ) -> List[int]:
+        """Candidate frame sizes long enough for ``fmin``."""
+        shortest = min_frames(sample_rate, fmin)
+        usable = [n for n in frames if n >= shortest]
+        return usable or [max(frames)]
+
+    def recommend(
+        self,
+        algo: str,
+        sample_rate: int,
+        fmin: float,
+        frames: Sequence[int] = CANDIDATE_FRAMES,
+    ) -> Optional[int]:
+        """Shortest frame size that keeps the headroom target.
+
+        Args:
+            algo: Detector name
+            sample_rate: Sample rate in Hz
+            fmin: Lowest frequency to detect in Hz
+            frames: Frame sizes to consider
+
+        Returns:
+            Frame size in samples, or None if no candidate is fast enough
+        """
+        for n in self.candidates(sample_rate, fmin, frames):
+            if self.load(algo, sample_rate, n) * self.headroom <= 1:
+                return n
+        return None
@@ -1,6 +1,19 @@
 import numpy as np
 import pytest
-from pda_cli.algos import autocorrelation, mpm, yin, zero_crossing_rate
+from pda_cli.algos import (
+    DETECTORS,
+    Cascade,
+    PitchTracker,
+    autocorrelation,
+    build_cascade,
+    kernels,
+    mpm,
+    mpm_result,
+    yin,
+    yin_result,
+    zero_crossing_rate,
+)
+from pda_cli.algos.tracking import clip_bands, lag_bands
 
 
 class TestPitchDetectionAlgorithms:
@@ -53,3 +66,262 @@ class TestPitchDetectionAlgorithms:
         for algo in [zero_crossing_rate, autocorrelation, yin, mpm]:
             pitch = algo(signal, 48000)
             assert pitch is None or pitch < 50  # Should detect no pitch or very low
+
+
+class TestPitchTracker:
+    @pytest.fixture
+    def sine(self):
+        t = np.arange(2048) / 48000
+        return np.sin(2 * np.pi * 440 * t)
+
+    def test_lag_bands_cover_octaves(self):
+        bands = lag_bands(100.0)
+        assert len(bands) == 3
+        assert bands[0][0] < 50 < bands[0][1]
+        assert bands[1][0] < 100 < bands[1][1]
+        assert bands[2][0] < 200 < bands[2][1]
+
+    def test_band_search_matches_full(self, sine):
+        bands = lag_bands(48000 / 440)
+        for algo in [autocorrelation, yin, mpm]:
+            full = algo(sine, 48000)
+            narrow = algo(sine, 48000, lag_bands=bands)
+            assert narrow is not None
+            assert abs(narrow - full) < 1
+
+    def test_band_search_misses_far_pitch(self, sine):
+        bands = lag_bands(48000 / 200)
+        for algo in [yin, mpm]:
+            assert algo(sine, 48000, lag_bands=bands) is None
+
+    def test_tracker_locks_and_falls_back(self, sine):
+        tracker = PitchTracker(yin_result)
+        for _ in range(3):
+            pitch = tracker.detect(sine, 48000).frequency
+            assert abs(pitch - 440) < 5
+        assert tracker.full == 1
+        assert tracker.tracked == 2
+
+        t = np.arange(2048) / 48000
+        pitch = tracker.detect(np.sin(2 * np.pi * 150 * t), 48000).frequency
+        assert abs(pitch - 150) < 5
+        assert tracker.full == 2
+
+    def test_tracker_rejects_subharmonic(self, sine):
+        t = np.arange(2048) / 48000
+        tracker = PitchTracker(yin_result)
+        tracker.detect(np.sin(2 * np.pi * 150 * t), 48000)
+
+        # 3 periods of 440 Hz sit inside the band around 150 Hz
+        pitch = tracker.detect(sine, 48000).frequency
+        assert abs(pitch - 440) < 5
+        assert tracker.full == 2
+
+    def test_steady_tracking_is_cheap(self):
+        t = np.arange(2048) / 48000
+        tone = sum(np.sin(2 * np.pi * 82 * k * t) / k for k in (1, 2, 3))
+        tau_max = 48000 // 50
+        searched = []
+
+        def counted(signal, sample_rate, lag_bands=None):
+            if lag_bands is not None:
+                clipped = clip_bands(lag_bands, 1, tau_max)
+                searched.append(sum(hi - lo for lo, hi in clipped))
+            return yin_result(signal, sample_rate, lag_bands=lag_bands)
+
+        tracker = PitchTracker(counted)
+        tracker.detect(tone, 48000)
+        for _ in range(5):
+            assert abs(tracker.detect(tone, 48000).frequency - 82) < 1
+
+        # A band search and a sub-multiple check per frame, each a fraction
+        # of the full lag range
+        assert len(searched) == 10
+        assert sum(searched) / 5 < 0.3 * tau_max
+
+    @pytest.mark.parametrize("name", ["acf", "yin", "mpm"])
+    def test_tracker_follows_exact_multiple_jump(self, name):
+        t = np.arange(2048) / 48000
+
+        def tone(frequency):
+            return sum(np.sin(2 * np.pi * frequency * k * t) / k for k in (1, 2, 3))
+
+        detector = DETECTORS[name]
+        tracker = PitchTracker(detector)
+        tracker.detect(tone(220), 48000)
+
+        # The old period is exactly three periods of 660 Hz
+        expected = detector(tone(660), 48000).frequency
+        for _ in range(3):
+            assert tracker.detect(tone(660), 48000).frequency == pytest.approx(
+                expected, rel=0.01
+            )
+
+    def test_tracker_reverifies_periodically(self, sine):
+        tracker = PitchTracker(yin_result, verify_every=4)
+        for _ in range(10):
+            tracker.detect(sine, 48000)
+        # Full searches on frames 1 and 6, four tracked frames after each
+        assert tracker.full == 2
+        assert tracker.tracked == 8
+
+    def test_tracker_reset(self, sine):
+        tracker = PitchTracker(mpm_result)
+        tracker.detect(sine, 48000)
+        tracker.reset()
+        tracker.detect(sine, 48000)
+        assert tracker.full == 2
+
+
+class TestConfidence:
+    @pytest.fixture
+    def sine(self):
+        t = np.arange(2048) / 48000
+        return np.sin(2 * np.pi * 440 * t)
+
+    def test_periodic_signal_is_confident(self, sine):
+        for name, detect in DETECTORS.items():
+            result = detect(sine, 48000)
+            assert result.frequency is not None, name
+            assert 0.8 < result.confidence <= 1.0, name
+
+    def test_noise_is_not_confident(self):
+        noise = np.random.default_rng(0).normal(0, 1, 2048)
+        for name, detect in DETECTORS.items():
+            assert detect(noise, 48000).confidence < 0.5, name
+
+    def test_silence_has_zero_confidence(self):
+        for detect in DETECTORS.values():
+            assert detect(np.zeros(2048), 48000).confidence == 0.0
+
+
+class TestCascade:
+    def test_confident_stage_answers(self):
+        t = np.arange(2048) / 48000
+        cascade = build_cascade("mpm")
+        result = cascade.detect(np.sin(2 * np.pi * 440 * t), 48000)
+        assert abs(result.frequency - 440) < 5
+        assert cascade.calls["mpm"] == 0
+        assert cascade.escalation_rates() == {"zcr": 0.0, "acf/4": 0.0}
+
+    @pytest.mark.parametrize("final", ["yin", "mpm"])
+    @pytest.mark.parametrize("frequency", [110, 330, 440, 1500, 2500])
+    def test_harmonic_tones(self, final, frequency):
+        t = np.arange(2048) / 48000
+        partials = [(1, 1.0), (2, 0.8), (3, 0.6), (4, 0.4)]
+        tone = sum(a * np.sin(2 * np.pi * frequency * k * t) for k, a in partials)
+
+        # Unguided, ZCR is an octave high here and the decimated ACF is cents
+        # sharp, or an octave low above 1 kHz; check each stage on its own
+        cascade = build_cascade(final)
+        for stages in (cascade.stages[::2], cascade.stages[1:]):
+            single = Cascade(stages)
+            result = single.detect(tone, 48000)
+            assert single.calls[final] == 0
+            assert abs(1200 * np.log2(result.frequency / frequency)) < 5
+
+        result = cascade.detect(tone, 48000)
+        assert cascade.calls[final] == 0
+        assert abs(1200 * np.log2(result.frequency / frequency)) < 5
+
+    @pytest.mark.parametrize("frequency", [55, 60, 82.4])
+    def test_low_sine(self, frequency):
+        t = np.arange(2048) / 48000
+        cascade = build_cascade("yin")
+        result = cascade.detect(np.sin(2 * np.pi * frequency * t), 48000)
+
+        # Raw ZCR is up to 27 cents sharp here, at a confidence above 0.9
+        assert cascade.escalation_rates()["zcr"] == 0.0
+        assert abs(1200 * np.log2(result.frequency / frequency)) < 1
+
+    def test_escalates_on_low_confidence(self):
+        def unsure(signal, sample_rate):
+            return DETECTORS["zcr"](signal, sample_rate)._replace(confidence=0.1)
+
+        t = np.arange(2048) / 48000
+        cascade = Cascade([("unsure", unsure), ("yin", yin_result)])
+        result = cascade.detect(np.sin(2 * np.pi * 440 * t), 48000)
+        assert abs(result.frequency - 440) < 5
+        assert cascade.escalation_rates() == {"unsure": 1.0}
+        assert cascade.calls["yin"] == 1
+
+
+def _reference(kernel):
+    """The pure Python function behind a kernel, JIT-compiled or not."""
+    return getattr(kernel, "py_func", kernel)
+
+
+class TestKernels:
+    @pytest.fixture
+    def frame(self):
+        t = np.arange(512) / 8000
+        noise = np.random.default_rng(1).normal(0, 0.2, 512)
+        return (np.sin(2 * np.pi * 220 * t) + noise).astype(np.float32)
+
+    def test_difference_matches_loop(self, frame):
+        expected = np.zeros(200)
+        for tau in range(1, 200):
+            expected[tau] = np.sum((frame[:-tau] - frame[tau:]) ** 2)
+        np.testing.assert_allclose(
+            kernels.difference(frame, 200), expected, rtol=1e-5, atol=1e-4
+        )
+
+    def test_nsdf_matches_loop(self, frame):
+        expected = np.zeros(256)
+        for tau in range(256):
+            head = frame[: len(frame) - tau].astype(np.float64)
+            tail = frame[tau:].astype(np.float64)
+            divisor = np.sqrt(head.dot(head) * tail.dot(tail))
+            expected[tau] = 2 * head.dot(tail) / divisor
+        np.testing.assert_allclose(
+            kernels.nsdf(frame, 256), expected, rtol=1e-6, atol=1e-9
+        )
+
+    def test_band_products_match_full(self, frame):
+        full = kernels._lag_products(frame, 256)
+        for lo, hi in [(1, 4), (40, 80), (200, 256)]:
+            np.testing.assert_allclose(
+                kernels.band_products(frame, lo, hi), full[lo:hi], rtol=1e-9
+            )
+
+    def test_nsdf_of_silence(self):
+        assert not kernels.nsdf(np.zeros(256, dtype=np.float32), 128).any()
+
+    def test_scans_match_reference(self, frame):
+        nsdf = kernels.nsdf(frame, 256)
+        cmndf = np.abs(nsdf - 1)
+        for threshold in (0.1, 0.3, 0.6):
+            assert kernels.yin_dip(cmndf, threshold) == _reference(kernels.yin_dip)(
+                cmndf, threshold
+            )
+            assert kernels.best_key_maximum(nsdf, threshold) == _reference(
+                kernels.best_key_maximum
+            )(nsdf, threshold)
+
+    def test_yin_dip_known_answers(self):
+        cmndf = np.array([1.0, 0.8, 0.5, 0.05, 0.02, 0.03, 0.5, 1.0])
+        # First value below threshold is at 3, the dip bottoms out at 4
+        assert kernels.yin_dip(cmndf, 0.1) == 4
+        assert kernels.yin_dip(cmndf, 0.01) == len(cmndf) - 1
+
+    def test_best_key_maximum_known_answers(self):
+        nsdf = np.array(
+            [1.0, 0.5, -0.2, 0.3, 0.6, 0.4, -0.1, 0.2, 0.9, 0.7, -0.3, 0.0]
+        )
+        # Key maxima at 4 (0.6) and 8 (0.9); the leading lobe is skipped
+        assert kernels.best_key_maximum(nsdf, 0.1) == 8
+        assert kernels.best_key_maximum(nsdf[:7], 0.1) == 4
+        assert kernels.best_key_maximum(nsdf, 0.95) == -1
+
+    def test_parabolic_offset(self):
+        # Vertex of -(x - 0.25)^2 sampled at -1, 0, 1
+        assert kernels.parabolic_offset(-1.5625, -0.0625, -0.5625) == pytest.approx(
+            0.25
+        )
+        assert kernels.parabolic_offset(1.0, 1.0, 1.0) == 0.0
+
+    def test_jit_selected_when_available(self):
+        pytest.importorskip("numba")
+        assert kernels.JIT_AVAILABLE
+        assert hasattr(kernels.yin_dip, "py_func")
+        assert hasattr(kernels.best_key_maximum, "py_func")
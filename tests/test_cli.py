@@ -1,3 +1,9 @@
+import csv
+import sys
+import types
+import wave
+
+import numpy as np
 from click.testing import CliRunner
 from pda_cli.cli import main
 
@@ -22,6 +28,93 @@ class TestCLI:
 
     def test_algo_choices(self):
         runner = CliRunner()
-        for algo in ["zcr", "acf", "yin", "mpm"]:
+        for algo in ["zcr", "acf", "yin", "mpm", "cascade"]:
             result = runner.invoke(main, ["--algo", algo, "--help"])
             assert result.exit_code == 0
+
+    def test_file_skips_quiet_frames(self, tmp_path):
+        sr = 16000
+        t = np.arange(sr // 2) / sr
+        tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+        signal = np.concatenate([np.zeros(sr), tone])
+        path = tmp_path / "take.wav"
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sr)
+            wav.writeframes((signal * 32767).astype(np.int16).tobytes())
+
+        runner = CliRunner()
+        result = runner.invoke(main, ["--file", str(path), "--frames", "1024"])
+        assert result.exit_code == 0
+        assert "0.00s: quiet until" in result.output
+        assert "frames as quiet" in result.output
+        assert "A3" in result.output
+
+    def test_invalid_frames(self):
+        runner = CliRunner()
+        result = runner.invoke(main, ["--frames", "lots"])
+        assert result.exit_code != 0
+        assert "sample count or 'auto'" in result.output
+
+    def test_tune(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        runner = CliRunner()
+        result = runner.invoke(main, ["--tune", "--sr", "16000", "--fmin", "100"])
+        assert result.exit_code == 0
+        assert "recommended" in result.output
+        assert list(tmp_path.glob("pda-cli/tune-*.json"))
+
+    def test_replay_fast(self):
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["--replay", "sine:440:0.5", "--replay-fast", "--smooth", "0"]
+        )
+        assert result.exit_code == 0
+        assert "Replay finished." in result.output
+        assert "deadline misses" in result.output
+
+    def test_replay_without_sounddevice(self, monkeypatch):
+        # A None entry makes any import of sounddevice raise ImportError
+        monkeypatch.setitem(sys.modules, "sounddevice", None)
+        runner = CliRunner()
+        result = runner.invoke(main, ["--replay", "sine:440:0.2", "--replay-fast"])
+        assert result.exit_code == 0
+        assert "Replay finished." in result.output
+
+    def test_stream_open_failure(self, monkeypatch, tmp_path):
+        def refuse(**kwargs):
+            raise ValueError("No input device matching 'nope'")
+
+        stub = types.SimpleNamespace(InputStream=refuse)
+        monkeypatch.setitem(sys.modules, "sounddevice", stub)
+        log = tmp_path / "log.csv"
+        runner = CliRunner()
+        result = runner.invoke(main, ["--device", "nope", "--log", str(log)])
+        assert result.exit_code == 1
+        assert "Error: No input device matching 'nope'" in result.output
+        assert "Log saved to" in result.output
+
+    def test_log_rows_match_header(self, tmp_path):
+        sr = 16000
+        t = np.arange(sr // 2) / sr
+        tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+        signal = np.concatenate([np.zeros(sr // 2), tone])
+        path = tmp_path / "take.wav"
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sr)
+            wav.writeframes((signal * 32767).astype(np.int16).tobytes())
+
+        log = tmp_path / "log.csv"
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["--replay", str(path), "--replay-fast", "--log", str(log)]
+        )
+        assert result.exit_code == 0
+
+        with open(log, newline="") as f:
+            header, *rows = list(csv.reader(f))
+        assert any(row[2] == "quiet" for row in rows)
+        assert all(len(row) == len(header) for row in rows)
@@ -0,0 +1,85 @@
+import time
+
+import numpy as np
+import pytest
+from pda_cli.replay import ReplayStream, load_source
+
+
+def _run(stream):
+    with stream:
+        while stream.active:
+            time.sleep(0.01)
+    return stream.stats
+
+
+class TestReplayStream:
+    def test_fast_delivers_every_block(self):
+        signal = np.arange(8000, dtype=np.float32)
+        blocks = []
+
+        def callback(indata, frames, time_info, status):
+            assert status is None
+            blocks.append((indata.shape, indata[0, 0], time_info.inputBufferAdcTime))
+
+        stats = _run(ReplayStream(callback, signal, 8000, 1000, realtime=False))
+
+        assert len(blocks) == 8
+        assert blocks[0] == ((1000, 1), 0.0, 0.0)
+        assert blocks[3][1:] == (3000.0, pytest.approx(0.375))
+        assert stats.overflows == 0
+        assert stats.deadline_misses == 0
+        assert stats.realtime_factor > 1
+
+    def test_slow_callback_misses_deadlines(self):
+        def callback(indata, frames, time_info, status):
+            time.sleep(0.02)
+
+        signal = np.zeros(800, dtype=np.float32)
+        stats = _run(ReplayStream(callback, signal, 8000, 80, latency=1.0))
+
+        assert len(stats.blocks) == 10
+        assert stats.deadline_misses >= 5
+        assert stats.latency_percentile(100) > 0.02
+
+    def test_stall_overflows_and_drops_backlog(self):
+        statuses = []
+
+        def callback(indata, frames, time_info, status):
+            statuses.append(str(status) if status else None)
+
+        signal = np.zeros(4000, dtype=np.float32)
+        stream = ReplayStream(
+            callback, signal, 8000, 80, stall_every=10, stall=0.15, latency=0.05
+        )
+        stats = _run(stream)
+
+        assert "input overflow" in statuses
+        assert stats.overflows >= 1
+        assert stats.dropped > 0
+        assert len(stats.blocks) + stats.dropped == 50
+
+    def test_callback_error_is_raised(self):
+        def callback(indata, frames, time_info, status):
+            raise RuntimeError("boom")
+
+        stream = ReplayStream(callback, np.zeros(800), 8000, 80, realtime=False)
+        with pytest.raises(RuntimeError, match="boom"):
+            _run(stream)
+
+    def test_write_csv(self, tmp_path):
+        stream = ReplayStream(
+            lambda *args: None, np.zeros(800), 8000, 80, realtime=False
+        )
+        stats = _run(stream)
+        path = tmp_path / "report.csv"
+        stats.write_csv(str(path))
+        lines = path.read_text().splitlines()
+        assert lines[0].startswith("block,due,delivered")
+        assert len(lines) == 11
+
+
+def test_load_sine_source():
+    signal, sr = load_source("sine:220:0.5", 16000)
+    assert sr == 16000
+    assert len(signal) == 8000
+    assert signal.dtype == np.float32
@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+from pda_cli import __version__
+from pda_cli.utils import AmplitudeGate, Autotuner, frame_rms, min_frames
+
+
+class TestSilencePrescan:
+    def test_frame_rms_matches_direct(self):
+        signal = np.random.default_rng(0).normal(0, 0.1, 10000).astype(np.float32)
+        rms = frame_rms(signal, 1024, 512)
+
+        starts = range(0, len(signal) - 1024, 512)
+        expected = [np.sqrt(np.mean(signal[i : i + 1024] ** 2)) for i in starts]
+        assert len(rms) == len(expected)
+        np.testing.assert_allclose(rms, expected, rtol=1e-5)
+
+    def test_gate_hysteresis_over_frames(self):
+        gate = AmplitudeGate(min_rms=0.01, hysteresis=0.8)
+        rms = np.array([0.0, 0.02, 0.009, 0.007, 0.02])
+        mask = gate.process_all(rms)
+        assert mask.tolist() == [False, True, True, False, True]
+
+
+class TestAutotuner:
+    def test_min_frames(self):
+        assert min_frames(48000, 50) == 1920
+        assert min_frames(16000, 80) == 400
+
+    def test_recommends_shortest_usable_frame(self, tmp_path):
+        tuner = Autotuner(
+            {"noop": lambda signal, sr: None}, cache_file=tmp_path / "tune.json"
+        )
+        assert tuner.candidates(48000, 50) == [2048, 4096, 8192]
+        assert tuner.recommend("noop", 48000, 50) == 2048
+
+    def test_none_when_too_slow(self, tmp_path):
+        tuner = Autotuner(
+            {"slow": lambda signal, sr: None},
+            headroom=4.0,
+            cache_file=tmp_path / "tune.json",
+        )
+        for n in tuner.candidates(48000, 50):
+            tuner.timings[f"slow/48000/{n}"] = n / 48000
+        assert tuner.recommend("slow", 48000, 50) is None
+
+    def test_cache_round_trip(self, tmp_path):
+        calls = []
+
+        def detector(signal, sr):
+            calls.append(len(signal))
+
+        cache_file = tmp_path / "tune.json"
+        first = Autotuner({"algo": detector}, cache_file=cache_file, repeats=3)
+        first.recommend("algo", 48000, 50)
+        first.save()
+        assert calls == [2048] * 4
+
+        second = Autotuner({"algo": detector}, cache_file=cache_file, repeats=3)
+        assert second.recommend("algo", 48000, 50) == 2048
+        assert len(calls) == 4
+
+    def test_cache_invalidated_by_jit_change(self, tmp_path):
+        cache_file = tmp_path / "tune.json"
+        data = {"version": __version__, "jit": True, "timings": {"a/1/2": 0.1}}
+        cache_file.write_text(json.dumps(data))
+        assert Autotuner({}, cache_file=cache_file, jit=True).timings
+        assert not Autotuner({}, cache_file=cache_file, jit=False).timings